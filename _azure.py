@@ -0,0 +1,184 @@
+"""
+Shared Azure client helpers
+
+Credentials and SDK clients are expensive to build (credential chain
+probing, token acquisition, registry discovery and HTTP pipeline setup), so
+both scripts obtain them through these helpers and reuse them process-wide.
+"""
+
+import functools
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from azure.ai.ml import MLClient
+from azure.mgmt.cognitiveservices import CognitiveServicesManagementClient
+from azure.core.pipeline.transport import RequestsTransport
+from azure.identity import DefaultAzureCredential
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Token scope for Azure Resource Manager
+ARM_SCOPE = "https://management.azure.com/.default"
+
+# Retry settings for all SDK clients. azure-core retries throttling (429) and
+# server errors (5xx) and honors Retry-After; this backs off harder than the default.
+RETRY_TOTAL = 5
+RETRY_BACKOFF_FACTOR = 2.0
+
+# Warn when fewer ARM reads than this remain in the subscription's throttling window
+RATE_LIMIT_WARNING_THRESHOLD = 100
+RATE_LIMIT_HEADER = "x-ms-ratelimit-remaining-subscription-reads"
+
+# Connection pool size of the shared HTTP transport; sized well above the number
+# of concurrent workers (16) so requests never queue for a free connection
+CONNECTION_POOL_SIZE = 64
+
+# HTTP transport shared by all SDK clients
+_transport: Optional[RequestsTransport] = None
+_transport_lock = threading.Lock()
+
+# MLClient instances by registry name
+_ml_client_cache: Dict[str, MLClient] = {}
+_ml_client_cache_lock = threading.Lock()
+
+# Serializes console output of both scripts' worker threads, including
+# warnings printed from response hooks
+print_lock = threading.Lock()
+
+# Set once the rate limit warning has been printed
+_rate_limit_warned = threading.Event()
+
+
+@functools.lru_cache(maxsize=None)
+def get_credential() -> DefaultAzureCredential:
+    """
+    Return the process-wide DefaultAzureCredential.
+    
+    The credential is safe to share between threads and caches the tokens it acquires.
+    
+    Returns:
+        DefaultAzureCredential instance
+    """
+    return DefaultAzureCredential()
+
+
+def warm_up_credential(credential: DefaultAzureCredential):
+    """
+    Acquire an ARM token once before work is fanned out to threads.
+    
+    DefaultAzureCredential remembers which credential in its chain succeeded, so
+    doing this on the main thread keeps concurrent workers from each walking the
+    chain (environment, managed identity, CLI, ...) on their first request.
+    
+    Args:
+        credential: Azure credential object
+    """
+    credential.get_token(ARM_SCOPE)
+
+
+def _check_rate_limit(response):
+    """
+    Response hook that warns once when the ARM read quota is nearly exhausted.
+    
+    Args:
+        response: azure-core PipelineResponse
+    """
+    remaining = response.http_response.headers.get(RATE_LIMIT_HEADER)
+    if remaining is None or _rate_limit_warned.is_set():
+        return
+    try:
+        if int(remaining) < RATE_LIMIT_WARNING_THRESHOLD:
+            _rate_limit_warned.set()
+            with print_lock:
+                print(f"Warning: only {remaining} ARM reads left before throttling; requests may be slowed down by retries")
+    except ValueError:
+        pass
+
+
+def get_transport() -> RequestsTransport:
+    """
+    Return the process-wide HTTP transport shared by all SDK clients.
+    
+    The default transport pools only 10 connections per host, which would cap the
+    effective parallelism of the registry workers. Retries are left to the
+    azure-core retry policy, as in the transport's own default session setup.
+    
+    Returns:
+        RequestsTransport backed by a pooled keep-alive session
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=CONNECTION_POOL_SIZE,
+                pool_maxsize=CONNECTION_POOL_SIZE,
+                max_retries=Retry(total=False, redirect=False, raise_on_status=False)
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            # The session outlives individual clients, so they must not close it
+            _transport = RequestsTransport(session=session, session_owner=False)
+        return _transport
+
+
+def get_client_kwargs() -> Dict[str, Any]:
+    """
+    Return the keyword arguments passed to every Azure SDK client.
+    
+    Returns:
+        Dictionary of client keyword arguments (shared transport, retry policy settings and response hook)
+    """
+    return {
+        "transport": get_transport(),
+        "retry_total": RETRY_TOTAL,
+        "retry_backoff_factor": RETRY_BACKOFF_FACTOR,
+        "raw_response_hook": _check_rate_limit,
+    }
+
+
+def get_registry_client(credential: DefaultAzureCredential, registry_name: str) -> MLClient:
+    """
+    Return an MLClient for an Azure ML Registry, reusing a previously created one.
+    
+    Clients are cached by registry name, so callers are expected to pass the
+    process-wide credential from get_credential().
+    
+    Args:
+        credential: Azure credential object
+        registry_name: Name of the registry
+    
+    Returns:
+        MLClient bound to the registry
+    """
+    with _ml_client_cache_lock:
+        ml_client = _ml_client_cache.get(registry_name)
+    if ml_client is not None:
+        return ml_client
+    
+    # Building the client performs registry discovery over the network, so it
+    # happens outside the lock to keep concurrent callers from serializing
+    ml_client = MLClient(credential=credential, registry_name=registry_name, **get_client_kwargs())
+    with _ml_client_cache_lock:
+        return _ml_client_cache.setdefault(registry_name, ml_client)
+
+
+@functools.lru_cache(maxsize=None)
+def get_cognitive_services_client(credential: DefaultAzureCredential, subscription_id: str) -> CognitiveServicesManagementClient:
+    """
+    Return the CognitiveServicesManagementClient for a subscription, reusing a previously created one.
+    
+    Args:
+        credential: Azure credential object
+        subscription_id: Azure subscription ID
+    
+    Returns:
+        CognitiveServicesManagementClient bound to the subscription
+    """
+    return CognitiveServicesManagementClient(
+        credential=credential,
+        subscription_id=subscription_id,
+        **get_client_kwargs()
+    )
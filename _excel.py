@@ -0,0 +1,232 @@
+"""
+Shared Excel writer
+
+Writes rows of values to a formatted .xlsx workbook with a styled and frozen
+header row and auto-sized columns.
+
+The export is a single sheet of plain values with one fixed header style, so
+the SpreadsheetML parts are generated directly instead of going through a
+spreadsheet library's per-cell object model.
+"""
+
+import functools
+import io
+import math
+import re
+import zipfile
+from typing import Any, Iterable, List, Sequence
+from xml.sax.saxutils import escape, quoteattr
+
+
+# Upper bound for auto-sized column widths (in characters)
+MAX_COLUMN_WIDTH = 50
+
+# Longest text that fits a column of the maximum width; longer data cells are wrapped
+MAX_UNWRAPPED_LENGTH = MAX_COLUMN_WIDTH - 2
+
+# Write buffer size of the output file in bytes
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Deflate level of the archive; with per-cell serialization this cheap, compression
+# is a large share of the export, and level 1 trades slightly larger files for speed
+ZIP_COMPRESSLEVEL = 1
+
+# Number of distinct cell texts whose escaped XML is cached; most columns
+# (source, format, kind, SKU, status, "N/A") only take a handful of values
+ESCAPE_CACHE_SIZE = 4096
+
+# Characters that are not allowed in XML 1.0 documents (control characters other than tab and newlines)
+ILLEGAL_CHARACTERS_RE = re.compile(r"[\000-\010\013\014\016-\037]")
+
+# Static package parts of the workbook
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name={name} sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+# Cell format 0 is the default; cell format 1 is the header style
+# (white bold font on a blue fill, centered and wrapped); cell format 2
+# top-aligns and wraps data cells that span several lines or are wider than
+# the column
+_STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><color rgb="FFFFFFFF"/><name val="Calibri"/><family val="2"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FF366092"/><bgColor rgb="FF366092"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center" wrapText="1"/></xf>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0" applyAlignment="1">'
+    '<alignment vertical="top" wrapText="1"/></xf>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+# Start of the worksheet, with the header row frozen
+_SHEET_HEAD_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '<selection pane="bottomLeft" activeCell="A2" sqref="A2"/>'
+    '</sheetView></sheetViews>'
+    '<sheetFormatPr defaultRowHeight="15"/>'
+)
+
+# Style attribute of the header cells (cell format 1 in _STYLES_XML)
+_HEADER_STYLE = ' s="1"'
+
+# Style attribute of multi-line or overlong data cells (cell format 2 in _STYLES_XML)
+_WRAP_STYLE = ' s="2"'
+
+
+def _column_letter(col_num: int) -> str:
+    """Return the column letter(s) for a 1-based column number (1 -> 'A', 27 -> 'AA')."""
+    letters = ""
+    while col_num:
+        col_num, remainder = divmod(col_num - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+@functools.lru_cache(maxsize=ESCAPE_CACHE_SIZE)
+def _inline_string(text: str) -> str:
+    """Return the XML-escaped inline string element for a cell text."""
+    return f'<is><t xml:space="preserve">{escape(ILLEGAL_CHARACTERS_RE.sub("", text))}</t></is>'
+
+
+def _cell_xml(ref: str, value: Any, style: str = "") -> str:
+    """
+    Build the XML of a single cell.
+    
+    Numbers and booleans are written as typed values and None as an empty
+    cell; everything else is written as an inline string. Unstyled strings
+    that contain line breaks or are longer than the widest column get the
+    wrapping style, so they are not shown as one clipped line.
+    
+    Args:
+        ref: Cell reference (e.g. 'B7')
+        value: Cell value
+        style: Style attribute to include (e.g. ' s="1"'), if any
+    
+    Returns:
+        The <c> element as a string
+    """
+    # Strings are checked first, as almost all values are strings
+    if type(value) is str:
+        if not style and (len(value) > MAX_UNWRAPPED_LENGTH or "\n" in value):
+            style = _WRAP_STYLE
+        return f'<c r="{ref}"{style} t="inlineStr">{_inline_string(value)}</c>'
+    if value is None:
+        return f'<c r="{ref}"{style}/>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)) and math.isfinite(value):
+        return f'<c r="{ref}"{style}><v>{value}</v></c>'
+    return f'<c r="{ref}"{style} t="inlineStr">{_inline_string(str(value))}</c>'
+
+
+def export_rows(rows: Iterable[Sequence[Any]], headers: List[str], output_file: str, sheet_title: str = "AI Foundry Models") -> int:
+    """
+    Export rows to an Excel file with formatting.
+    
+    Args:
+        rows: Iterable of rows, each holding one value per header in header order
+        headers: Column headers, in output order
+        output_file: Path to output Excel file
+        sheet_title: Title of the worksheet
+    
+    Returns:
+        Number of rows exported
+    """
+    # Column widths precede the rows in the sheet XML, so the rows are collected
+    # first (as they are) to size the columns
+    values = list(rows)
+    
+    # Auto-adjust column widths. Each column is scanned with map/max, which runs
+    # the per-value len(str(...)) in C instead of a Python loop over every cell;
+    # widths start at the header lengths.
+    max_widths = [len(header) for header in headers]
+    for col_idx, column in enumerate(zip(*values)):
+        max_widths[col_idx] = max(max_widths[col_idx], max(map(len, map(str, column))))
+    
+    # Column letters are computed once and shared by all rows
+    letters = [_column_letter(col_num) for col_num in range(1, len(headers) + 1)]
+    
+    # The archive is written in many small compressed chunks, so the output file
+    # gets a large buffer to keep them from each becoming a write() call
+    with open(output_file, "wb", buffering=WRITE_BUFFER_SIZE) as f, zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES_XML)
+        archive.writestr("_rels/.rels", _ROOT_RELS_XML)
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS_XML)
+        archive.writestr("xl/workbook.xml", _WORKBOOK_XML.format(name=quoteattr(sheet_title)))
+        archive.writestr("xl/styles.xml", _STYLES_XML)
+        
+        # The sheet is streamed into the archive row by row
+        with io.TextIOWrapper(archive.open("xl/worksheets/sheet1.xml", "w"), encoding="utf-8") as sheet:
+            write = sheet.write
+            write(_SHEET_HEAD_XML)
+            
+            write("<cols>")
+            for col_num, max_length in enumerate(max_widths, 1):
+                write(f'<col min="{col_num}" max="{col_num}" width="{min(max_length + 2, MAX_COLUMN_WIDTH)}" customWidth="1"/>')
+            write("</cols>")
+            
+            write("<sheetData>")
+            
+            # Write headers
+            write('<row r="1">')
+            for letter, header in zip(letters, headers):
+                write(_cell_xml(f"{letter}1", header, _HEADER_STYLE))
+            write("</row>")
+            
+            # Write data
+            for row_num, row_values in enumerate(values, 2):
+                write(f'<row r="{row_num}">')
+                for letter, value in zip(letters, row_values):
+                    write(_cell_xml(f"{letter}{row_num}", value))
+                write("</row>")
+            
+            write("</sheetData></worksheet>")
+    
+    return len(values)
@@ -6,21 +6,70 @@ This script attempts to discover available Azure ML public/system registries
 by testing connections to known registry names and trying to list models.
 """
 
+import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 
-from azure.ai.ml import MLClient
 from azure.identity import DefaultAzureCredential
 from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
 
+from _azure import get_credential, get_registry_client, print_lock, warm_up_credential
 
-def test_registry(credential: DefaultAzureCredential, registry_name: str) -> Dict[str, Any]:
+
+# Maximum number of registries probed concurrently
+MAX_WORKERS = 16
+
+# Known registry names from official Microsoft documentation and current codebase
+# Based on the image provided in the issue, these are the collections shown in the UI:
+# - Core42, DeepSeek, Meta, Microsoft, Mistral AI, OpenAI, Stability AI, xAI
+# 
+# Registry names discovered from Microsoft documentation:
+# - azureml: Main Azure ML registry (includes Microsoft/Phi models)
+# - azureml-meta: Meta/Llama models
+# - azureml-cohere: Cohere models
+# - azureml-mistral: Mistral models
+# - azureml-xai: xAI models (Grok)
+# - azureml-deepseek: DeepSeek models
+# - azureml-core42: Core42 models (Jais)
+# - azureml-stabilityai: Stability AI models (Stable Diffusion)
+# - azureml-nvidia: NVIDIA models
+# - HuggingFace: Hugging Face models
+# - azureml-gretel: Gretel models
+#
+# Note: OpenAI models appear to be in the main "azureml" registry or via Azure OpenAI service
+KNOWN_REGISTRIES = [
+    "azureml",              # Main Azure ML registry (Microsoft/Phi models, OpenAI, etc.)
+    "azureml-meta",         # Meta/Llama models
+    "azureml-cohere",       # Cohere models
+    "azureml-mistral",      # Mistral models
+    "azureml-xai",          # xAI models (Grok)
+    "azureml-deepseek",     # DeepSeek models
+    "azureml-core42",       # Core42 models (Jais - Arabic/English)
+    "azureml-stabilityai",  # Stability AI models (Stable Diffusion, Stable Image)
+    "azureml-nvidia",       # NVIDIA models
+    "HuggingFace",          # Hugging Face models
+    "azureml-gretel",       # Gretel models
+]
+
+# Potential registries that are not confirmed to exist; only probed with --include-experimental
+KNOWN_EXPERIMENTAL = [
+    "azureml-anthropic",    # Anthropic models (Claude) - if exists
+    "azureml-google",       # Google models (Gemini) - if exists
+    "azureml-ai21",         # AI21 models - if exists
+    "azureml-databricks",   # Databricks models - if exists
+    "azureml-openai",       # OpenAI models (separate registry) - if exists
+]
+
+
+def test_registry(credential: DefaultAzureCredential, registry_name: str, full: bool = False) -> Dict[str, Any]:
     """
     Test if a registry is accessible by attempting to connect and list models.
     
     Args:
         credential: Azure credential object
         registry_name: Name of the registry to test
+        full: Also count models (up to 10) and collect sample model names
         
     Returns:
         Dictionary with test results
@@ -28,54 +77,71 @@ def test_registry(credential: DefaultAzureCredential, registry_name: str) -> Dic
     result = {
         "name": registry_name,
         "accessible": False,
-        "model_count": 0,
+        "model_count": None,
         "error": None,
         "sample_models": []
     }
     
+    # Output is buffered and emitted in one block so concurrent probes don't interleave
+    output = [f"Testing registry: {registry_name}..."]
+    
     try:
-        print(f"Testing registry: {registry_name}...")
+        # Get (or create) the MLClient for the registry
+        ml_client = get_registry_client(credential, registry_name)
         
-        # Create MLClient for the registry
-        ml_client = MLClient(credential=credential, registry_name=registry_name)
-        
-        # Try to list models (just get first few to verify access)
         models = ml_client.models.list()
         
-        count = 0
-        sample_models = []
-        for model in models:
-            count += 1
-            if count <= 5:  # Get first 5 as samples
-                sample_models.append(model.name if hasattr(model, 'name') else "N/A")
-            if count >= 10:  # Stop after counting 10 to save time
-                break
+        if full:
+            count = 0
+            sample_models = []
+            for model in models:
+                count += 1
+                if count <= 5:  # Get first 5 as samples
+                    sample_models.append(getattr(model, 'name', "N/A"))
+                if count >= 10:  # Stop after counting 10 to save time
+                    break
+            
+            result["model_count"] = f"{count}+" if count >= 10 else count
+            result["sample_models"] = sample_models
+        else:
+            # Requesting the first page is enough to verify access
+            next(iter(models), None)
         
         result["accessible"] = True
-        result["model_count"] = f"{count}+" if count >= 10 else count
-        result["sample_models"] = sample_models
         
-        print(f"  ✓ Accessible - Found {result['model_count']} models")
-        if sample_models:
-            print(f"    Sample models: {', '.join(sample_models[:3])}")
+        if result["model_count"] is None:
+            output.append("  ✓ Accessible")
+        else:
+            output.append(f"  ✓ Accessible - Found {result['model_count']} models")
+        if result["sample_models"]:
+            output.append(f"    Sample models: {', '.join(result['sample_models'][:3])}")
         
     except HttpResponseError as e:
         result["error"] = f"HTTP Error: {e.status_code} - {e.message}"
-        print(f"  ✗ Not accessible - HTTP Error {e.status_code}")
+        output.append(f"  ✗ Not accessible - HTTP Error {e.status_code}")
     except ResourceNotFoundError as e:
         result["error"] = f"Registry not found: {str(e)}"
-        print(f"  ✗ Not found")
+        output.append(f"  ✗ Not found")
     except Exception as e:
         result["error"] = f"Error: {type(e).__name__} - {str(e)}"
-        print(f"  ✗ Error: {type(e).__name__}")
+        output.append(f"  ✗ Error: {type(e).__name__}")
+    
+    with print_lock:
+        print("\n".join(output))
+        print()
     
     return result
 
 
-def discover_registries() -> List[Dict[str, Any]]:
+def discover_registries(registry_names: List[str], with_samples: bool = False, max_workers: int = MAX_WORKERS) -> List[Dict[str, Any]]:
     """
-    Discover available Azure ML registries by testing known registry names.
+    Discover available Azure ML registries by testing the given registry names.
     
+    Args:
+        registry_names: Names of the registries to test
+        with_samples: Also count models and collect sample model names for each registry
+        max_workers: Maximum number of registries probed concurrently (1 probes sequentially)
+        
     Returns:
         List of registry test results
     """
@@ -84,56 +150,19 @@ def discover_registries() -> List[Dict[str, Any]]:
     print("=" * 60)
     print()
     
-    # Known registry names from official Microsoft documentation and current codebase
-    # Based on the image provided in the issue, these are the collections shown in the UI:
-    # - Core42, DeepSeek, Meta, Microsoft, Mistral AI, OpenAI, Stability AI, xAI
-    # 
-    # Registry names discovered from Microsoft documentation:
-    # - azureml: Main Azure ML registry (includes Microsoft/Phi models)
-    # - azureml-meta: Meta/Llama models
-    # - azureml-cohere: Cohere models
-    # - azureml-mistral: Mistral models
-    # - azureml-xai: xAI models (Grok)
-    # - azureml-deepseek: DeepSeek models
-    # - azureml-core42: Core42 models (Jais)
-    # - azureml-stabilityai: Stability AI models (Stable Diffusion)
-    # - azureml-nvidia: NVIDIA models
-    # - HuggingFace: Hugging Face models
-    # - azureml-gretel: Gretel models
-    #
-    # Note: OpenAI models appear to be in the main "azureml" registry or via Azure OpenAI service
-    known_registries = [
-        "azureml",              # Main Azure ML registry (Microsoft/Phi models, OpenAI, etc.)
-        "azureml-meta",         # Meta/Llama models
-        "azureml-cohere",       # Cohere models
-        "azureml-mistral",      # Mistral models
-        "azureml-xai",          # xAI models (Grok)
-        "azureml-deepseek",     # DeepSeek models
-        "azureml-core42",       # Core42 models (Jais - Arabic/English)
-        "azureml-stabilityai",  # Stability AI models (Stable Diffusion, Stable Image)
-        "azureml-nvidia",       # NVIDIA models
-        "HuggingFace",          # Hugging Face models
-        "azureml-gretel",       # Gretel models
-        # Additional potential registries to test:
-        "azureml-anthropic",    # Anthropic models (Claude) - if exists
-        "azureml-google",       # Google models (Gemini) - if exists
-        "azureml-ai21",         # AI21 models - if exists
-        "azureml-databricks",   # Databricks models - if exists
-        "azureml-openai",       # OpenAI models (separate registry) - if exists
-    ]
-    
     try:
-        credential = DefaultAzureCredential()
+        credential = get_credential()
+        # Authenticate once up front so the concurrent probes reuse the token
+        warm_up_credential(credential)
         print("Successfully authenticated with Azure\n")
     except Exception as e:
         print(f"Error authenticating with Azure: {e}")
         sys.exit(1)
     
-    results = []
-    for registry_name in known_registries:
-        result = test_registry(credential, registry_name)
-        results.append(result)
-        print()
+    # Probing is I/O-bound, so registries are tested concurrently; the credential
+    # and the per-registry MLClients are shared across threads
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(registry_names)))) as executor:
+        results = list(executor.map(lambda name: test_registry(credential, name, with_samples), registry_names))
     
     return results
 
@@ -163,7 +192,8 @@ def print_summary(results: List[Dict[str, Any]]):
         print("-" * 60)
         for r in accessible:
             print(f"  • {r['name']}")
-            print(f"    Model count: {r['model_count']}")
+            if r['model_count'] is not None:
+                print(f"    Model count: {r['model_count']}")
             if r['sample_models']:
                 print(f"    Sample models: {', '.join(r['sample_models'][:3])}")
         print()
@@ -186,9 +216,41 @@ def print_summary(results: List[Dict[str, Any]]):
         print()
 
 
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Discover accessible Azure ML registries.")
+    parser.add_argument("--registries",
+                        help="Comma-separated list of registry names to test (default: the known registries)")
+    parser.add_argument("--include-experimental", action="store_true",
+                        help="Also test registry names that are not confirmed to exist")
+    parser.add_argument("--parallel", type=int, default=MAX_WORKERS, metavar="N",
+                        help=f"Number of registries to test concurrently (default: {MAX_WORKERS}; 1 tests sequentially)")
+    parser.add_argument("--with-samples", action="store_true",
+                        help="Count models (up to 10) and show sample model names for each accessible registry")
+    args = parser.parse_args()
+    
+    if args.parallel < 1:
+        parser.error("--parallel must be at least 1")
+    
+    return args
+
+
 def main():
     """Main execution function."""
-    results = discover_registries()
+    args = parse_args()
+    
+    if args.registries:
+        registry_names = [name.strip() for name in args.registries.split(",") if name.strip()]
+    else:
+        registry_names = list(KNOWN_REGISTRIES)
+    if args.include_experimental:
+        registry_names += [name for name in KNOWN_EXPERIMENTAL if name not in registry_names]
+    
+    if not registry_names:
+        print("Error: No registry names to test.")
+        sys.exit(1)
+    
+    results = discover_registries(registry_names, with_samples=args.with_samples, max_workers=args.parallel)
     print_summary(results)
 
 
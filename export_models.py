@@ -6,26 +6,149 @@ This script fetches all available models from Azure AI Foundry (Model Catalog)
 and Azure ML Registries, then exports them to an Excel file with details about each model.
 """
 
+import argparse
+import csv
+import importlib.util
+import itertools
+import json
 import os
 import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Any, Callable, Iterable, Iterator, Optional, Tuple
 
 from azure.mgmt.cognitiveservices import CognitiveServicesManagementClient
-from azure.ai.ml import MLClient
 from azure.identity import DefaultAzureCredential
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
 from dotenv import load_dotenv
 
+from _azure import get_cognitive_services_client, get_credential, get_registry_client, print_lock, warm_up_credential
+from _excel import export_rows
 
-def get_management_client() -> tuple[CognitiveServicesManagementClient, str]:
+
+# Maximum number of registries fetched concurrently
+MAX_WORKERS = 16
+
+# Columns of the export, in output order
+HEADERS = ["Source", "Name", "Version", "Description", "Format", "Kind", "SKU", "Lifecycle Status", "Max Capacity", "Created Date", "Created By", "Last Modified Date", "Last Modified By"]
+
+# A model row: one value per column, in HEADERS order
+ModelRow = Tuple[Any, ...]
+
+# Format used for created/modified timestamps in the export
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Location of cached model listings and their default time-to-live in seconds
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ai-foundry-export")
+DEFAULT_CACHE_TTL = 3600
+
+# Write buffer size of the CSV exporter in bytes
+CSV_BUFFER_SIZE = 1 << 20
+
+# Bump whenever the layout of the cached model dictionaries changes
+CACHE_VERSION = 2
+
+
+def _attr(obj: Any, name: str, fmt: Optional[Callable[[Any], Any]] = None) -> Any:
     """
-    Create and return a CognitiveServicesManagementClient for accessing Azure AI Foundry.
+    Look up an attribute once, returning "N/A" if it is missing, None or empty.
     
+    Args:
+        obj: Object to read the attribute from (may be None)
+        name: Attribute name
+        fmt: Optional function applied to the attribute value when present
+        
     Returns:
-        tuple: (CognitiveServicesManagementClient, location)
+        The (formatted) attribute value, or "N/A"
+    """
+    value = getattr(obj, name, None)
+    if value is None or value == "":
+        return "N/A"
+    return fmt(value) if fmt else value
+
+
+def _format_date(value: datetime) -> str:
+    """Format a created/modified timestamp for the export."""
+    return value.strftime(DATE_FORMAT)
+
+
+def _cache_path(key: str) -> str:
+    """
+    Return the cache file path for a listing key (e.g. 'registry-azureml').
+    
+    Args:
+        key: Cache key identifying the listing
+        
+    Returns:
+        Path to the JSON cache file
+    """
+    return os.path.join(CACHE_DIR, f"{key}.v{CACHE_VERSION}.json")
+
+
+def _load_cache(key: str, ttl: int) -> Optional[List[ModelRow]]:
+    """
+    Load a cached model listing if it exists and is younger than ttl seconds.
+    
+    Args:
+        key: Cache key identifying the listing
+        ttl: Maximum age of the cache file in seconds (0 disables the cache)
+        
+    Returns:
+        List of model rows, or None on a cache miss
+    """
+    if ttl <= 0:
+        return None
+    
+    path = _cache_path(key)
+    try:
+        if time.time() - os.path.getmtime(path) >= ttl:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    # Anything but a list of complete rows (e.g. a truncated or hand-edited file) is a miss
+    if not isinstance(rows, list) or not all(isinstance(row, list) and len(row) == len(HEADERS) for row in rows):
+        return None
+    # JSON has no tuples, so the rows come back as lists
+    return [tuple(row) for row in rows]
+
+
+def _save_cache(key: str, models_data: List[ModelRow]):
+    """
+    Atomically write a model listing to the cache.
+    
+    Args:
+        key: Cache key identifying the listing
+        models_data: List of model rows to cache
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(models_data, f, default=str)
+            os.replace(tmp_path, _cache_path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        with print_lock:
+            print(f"Warning: could not write cache for '{key}': {e}")
+
+
+def get_management_client() -> tuple[CognitiveServicesManagementClient, str, str]:
+    """
+    Return a CognitiveServicesManagementClient for accessing Azure AI Foundry.
+    
+    The client (and its pooled HTTP transport) is created once per subscription
+    and reused on later calls, e.g. when this module is imported and called repeatedly.
+    
+    Returns:
+        tuple: (CognitiveServicesManagementClient, subscription ID, location)
     """
     load_dotenv()
     
@@ -39,216 +162,375 @@ def get_management_client() -> tuple[CognitiveServicesManagementClient, str]:
         sys.exit(1)
     
     try:
-        credential = DefaultAzureCredential()
-        client = CognitiveServicesManagementClient(
-            credential=credential,
-            subscription_id=subscription_id
-        )
-        return client, location
+        client = get_cognitive_services_client(get_credential(), subscription_id)
+        return client, subscription_id, location
     except Exception as e:
         print(f"Error creating management client: {e}")
         sys.exit(1)
 
 
-def fetch_models(client: CognitiveServicesManagementClient, location: str) -> List[Dict[str, Any]]:
+def fetch_models(client: CognitiveServicesManagementClient, subscription_id: str, location: str, cache_ttl: int = 0, refresh_cache: bool = False, verbose: bool = False) -> Iterator[ModelRow]:
     """
     Fetch all models from the AI Foundry catalog using the Account Management API.
     
+    Models are yielded as they are paged in, so callers can stream them to the output.
+    Fields that are not available are set to "N/A".
+    
     Args:
         client: The CognitiveServicesManagementClient instance
+        subscription_id: Azure subscription ID the client is bound to (the catalog is subscription-scoped)
         location: Azure region location
+        cache_ttl: Reuse a cached listing younger than this many seconds (0 disables the cache)
+        refresh_cache: Skip the cached listing but still write the fetched one to the cache
+        verbose: Print the full traceback if fetching fails
         
-    Returns:
-        List of model dictionaries with their details
+    Yields:
+        Model rows, in HEADERS order
     """
-    print(f"Fetching models from AI Foundry catalog in location '{location}'...")
-    models_data = []
+    cache_key = f"catalog-{subscription_id}-{location}"
+    cached_models = None if refresh_cache else _load_cache(cache_key, cache_ttl)
+    if cached_models is not None:
+        with print_lock:
+            print(f"Loaded {len(cached_models)} models for location '{location}' from cache")
+        yield from cached_models
+        return
+    
+    with print_lock:
+        print(f"Fetching models from AI Foundry catalog in location '{location}'...")
+    # Rows are only retained when they have to be written to the cache
+    cache_rows = [] if cache_ttl > 0 else None
+    cache_append = cache_rows.append if cache_rows is not None else None
+    count = 0
     
     try:
         models = client.models.list(location=location)
         
         for model in models:
             # Extract model details from the Account Management API response
-            model_details = model.model if hasattr(model, 'model') else None
+            model_details = getattr(model, 'model', None)
             
             if model_details:
-                model_info = {
-                    "Source": "AI Foundry Catalog",
-                    "Name": model_details.name if hasattr(model_details, 'name') else "N/A",
-                    "Version": model_details.version if hasattr(model_details, 'version') else "N/A",
-                    "Description": model.description if hasattr(model, 'description') and model.description else "N/A",
-                    "Format": model_details.format if hasattr(model_details, 'format') else "N/A",
-                    "Kind": model.kind if hasattr(model, 'kind') else "N/A",
-                    "SKU": model.sku_name if hasattr(model, 'sku_name') else "N/A",
-                    "Lifecycle Status": model_details.lifecycle_status if hasattr(model_details, 'lifecycle_status') else "N/A",
-                    "Max Capacity": model_details.max_capacity if hasattr(model_details, 'max_capacity') else "N/A",
-                }
+                # System data may be missing, in which case its fields are "N/A"
+                system_data = getattr(model_details, 'system_data', None)
+                model_info = (
+                    "AI Foundry Catalog",
+                    _attr(model_details, 'name'),
+                    _attr(model_details, 'version'),
+                    _attr(model, 'description'),
+                    _attr(model_details, 'format'),
+                    _attr(model, 'kind'),
+                    _attr(model, 'sku_name'),
+                    _attr(model_details, 'lifecycle_status'),
+                    _attr(model_details, 'max_capacity'),
+                    _attr(system_data, 'created_at', _format_date),
+                    _attr(system_data, 'created_by'),
+                    _attr(system_data, 'last_modified_at', _format_date),
+                    _attr(system_data, 'last_modified_by'),
+                )
                 
-                # Add system data if available
-                if hasattr(model_details, 'system_data') and model_details.system_data:
-                    system_data = model_details.system_data
-                    model_info["Created Date"] = system_data.created_at.strftime("%Y-%m-%d %H:%M:%S") if hasattr(system_data, 'created_at') and system_data.created_at else "N/A"
-                    model_info["Created By"] = system_data.created_by if hasattr(system_data, 'created_by') else "N/A"
-                    model_info["Last Modified Date"] = system_data.last_modified_at.strftime("%Y-%m-%d %H:%M:%S") if hasattr(system_data, 'last_modified_at') and system_data.last_modified_at else "N/A"
-                    model_info["Last Modified By"] = system_data.last_modified_by if hasattr(system_data, 'last_modified_by') else "N/A"
-                else:
-                    model_info["Created Date"] = "N/A"
-                    model_info["Created By"] = "N/A"
-                    model_info["Last Modified Date"] = "N/A"
-                    model_info["Last Modified By"] = "N/A"
-                
-                models_data.append(model_info)
+                if cache_append is not None:
+                    cache_append(model_info)
+                count += 1
+                yield model_info
             
-        print(f"Found {len(models_data)} models")
-        return models_data
+        with print_lock:
+            print(f"Found {count} models")
+        if cache_rows is not None:
+            _save_cache(cache_key, cache_rows)
         
     except Exception as e:
-        print(f"Error fetching models: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+        with print_lock:
+            print(f"Error fetching models: {type(e).__name__}: {e}")
+            if verbose:
+                traceback.print_exception(type(e), e, e.__traceback__)
 
 
-def fetch_registry_models(credential: DefaultAzureCredential, registry_names: List[str]) -> List[Dict[str, Any]]:
+def _fetch_registry(credential: DefaultAzureCredential, registry_name: str, cache_ttl: int = 0, refresh_cache: bool = False) -> Tuple[List[ModelRow], Optional[Exception]]:
     """
-    Fetch all models from Azure ML Registries.
+    Fetch all models from a single Azure ML Registry.
+    
+    Fields that are not available are set to "N/A".
     
     Args:
         credential: Azure credential object
-        registry_names: List of registry names to fetch models from (e.g., ['azureml', 'azureml-meta'])
+        registry_name: Name of the registry to fetch models from
+        cache_ttl: Reuse a cached listing younger than this many seconds (0 disables the cache)
+        refresh_cache: Skip the cached listing but still write the fetched one to the cache
         
     Returns:
-        List of model dictionaries with their details
+        tuple: (list of model rows, exception or None); the list is empty on error
     """
-    all_models_data = []
+    cache_key = f"registry-{registry_name}"
+    models_data = None if refresh_cache else _load_cache(cache_key, cache_ttl)
+    if models_data is not None:
+        with print_lock:
+            print(f"Loaded {len(models_data)} models for registry '{registry_name}' from cache")
+        return models_data, None
     
-    for registry_name in registry_names:
+    with print_lock:
         print(f"Fetching models from Azure ML Registry '{registry_name}'...")
-        try:
-            # Create MLClient for the registry
-            ml_client = MLClient(credential=credential, registry_name=registry_name)
-            
-            # List all models in the registry
-            models = ml_client.models.list()
+    
+    models_data = []
+    try:
+        # Reuse the MLClient for the registry for the whole listing
+        ml_client = get_registry_client(credential, registry_name)
+        
+        # List all models in the registry
+        models = ml_client.models.list()
+        
+        # Loop invariants are bound once outside the per-model loop
+        source = f"Azure ML Registry ({registry_name})"
+        append = models_data.append
+        
+        for model in models:
+            description = _attr(model, 'description')
             
-            count = 0
-            for model in models:
-                model_info = {
-                    "Source": f"Azure ML Registry ({registry_name})",
-                    "Name": model.name if hasattr(model, 'name') else "N/A",
-                    "Version": str(model.version) if hasattr(model, 'version') else "N/A",
-                    "Description": model.description if hasattr(model, 'description') and model.description else "N/A",
-                    "Format": model.type if hasattr(model, 'type') else "N/A",
-                    "Kind": "N/A",
-                    "SKU": "N/A",
-                    "Lifecycle Status": model.stage if hasattr(model, 'stage') and model.stage else "N/A",
-                    "Max Capacity": "N/A",
-                }
-                
-                # Add tags as additional info if available
-                if hasattr(model, 'tags') and model.tags:
-                    tags_str = ", ".join([f"{k}={v}" for k, v in model.tags.items()]) if isinstance(model.tags, dict) else str(model.tags)
-                    if model_info["Description"] == "N/A":
-                        model_info["Description"] = f"Tags: {tags_str}"
-                    else:
-                        model_info["Description"] += f" | Tags: {tags_str}"
-                
-                # Add creation metadata if available
-                if hasattr(model, 'creation_context') and model.creation_context:
-                    creation_context = model.creation_context
-                    model_info["Created Date"] = creation_context.created_at.strftime("%Y-%m-%d %H:%M:%S") if hasattr(creation_context, 'created_at') and creation_context.created_at else "N/A"
-                    model_info["Created By"] = creation_context.created_by if hasattr(creation_context, 'created_by') else "N/A"
-                    model_info["Last Modified Date"] = creation_context.last_modified_at.strftime("%Y-%m-%d %H:%M:%S") if hasattr(creation_context, 'last_modified_at') and creation_context.last_modified_at else "N/A"
-                    model_info["Last Modified By"] = creation_context.last_modified_by if hasattr(creation_context, 'last_modified_by') else "N/A"
+            # Add tags as additional info if available
+            tags = getattr(model, 'tags', None)
+            if tags:
+                tags_str = ", ".join([f"{k}={v}" for k, v in tags.items()]) if isinstance(tags, dict) else str(tags)
+                if description == "N/A":
+                    description = f"Tags: {tags_str}"
                 else:
-                    model_info["Created Date"] = "N/A"
-                    model_info["Created By"] = "N/A"
-                    model_info["Last Modified Date"] = "N/A"
-                    model_info["Last Modified By"] = "N/A"
-                
-                all_models_data.append(model_info)
-                count += 1
+                    description += f" | Tags: {tags_str}"
             
-            print(f"Found {count} models in registry '{registry_name}'")
+            # Creation metadata may be missing, in which case its fields are "N/A"
+            creation_context = getattr(model, 'creation_context', None)
             
-        except Exception as e:
-            print(f"Error fetching models from registry '{registry_name}': {e}")
-            import traceback
-            traceback.print_exc()
+            append((
+                source,
+                _attr(model, 'name'),
+                _attr(model, 'version', str),
+                description,
+                _attr(model, 'type'),
+                "N/A",  # Kind
+                "N/A",  # SKU
+                _attr(model, 'stage'),
+                "N/A",  # Max Capacity
+                _attr(creation_context, 'created_at', _format_date),
+                _attr(creation_context, 'created_by'),
+                _attr(creation_context, 'last_modified_at', _format_date),
+                _attr(creation_context, 'last_modified_by'),
+            ))
+        
+        with print_lock:
+            print(f"Found {len(models_data)} models in registry '{registry_name}'")
+        if cache_ttl > 0:
+            _save_cache(cache_key, models_data)
+        
+    except Exception as e:
+        # Errors are reported by the caller once all registries have been fetched
+        return [], e
     
-    return all_models_data
+    return models_data, None
 
 
-def export_to_excel(models_data: List[Dict[str, Any]], output_file: str):
+def fetch_registry_models(credential: DefaultAzureCredential, registry_names: List[str], cache_ttl: int = 0, refresh_cache: bool = False, verbose: bool = False) -> Iterator[ModelRow]:
+    """
+    Fetch all models from Azure ML Registries.
+    
+    Registries are listed concurrently, starting as soon as this function is called,
+    so the fetches overlap with whatever the caller does before consuming the result
+    (such as paging through the AI Foundry catalog). Models are yielded per registry
+    in the order of registry_names. Registries that could not be fetched are
+    reported in one summary at the end.
+    
+    Args:
+        credential: Azure credential object
+        registry_names: List of registry names to fetch models from (e.g., ['azureml', 'azureml-meta'])
+        cache_ttl: Reuse cached listings younger than this many seconds (0 disables the cache)
+        refresh_cache: Skip the cached listings but still write the fetched ones to the cache
+        verbose: Print full tracebacks for registries that could not be fetched
+        
+    Returns:
+        Iterator over model rows, in HEADERS order
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(registry_names))))
+    futures = [executor.submit(_fetch_registry, credential, name, cache_ttl, refresh_cache) for name in registry_names]
+    # The workers keep running the submitted fetches and exit once they are done
+    executor.shutdown(wait=False)
+    
+    return _collect_registry_models(registry_names, futures, verbose)
+
+
+def _collect_registry_models(registry_names: List[str], futures: List[Future], verbose: bool) -> Iterator[ModelRow]:
+    """
+    Yield the models of running registry fetches in order, then report failures.
+    
+    Args:
+        registry_names: Registry names, in the order their fetches were submitted
+        futures: Futures of the _fetch_registry calls
+        verbose: Print full tracebacks for registries that could not be fetched
+        
+    Yields:
+        Model rows, in HEADERS order
+    """
+    errors = []
+    
+    for registry_name, future in zip(registry_names, futures):
+        models_data, error = future.result()
+        if error is not None:
+            errors.append((registry_name, error))
+        yield from models_data
+    
+    if errors:
+        print(f"Could not fetch models from {len(errors)} of {len(registry_names)} registries:")
+        for registry_name, error in errors:
+            print(f"  • {registry_name}: {type(error).__name__}: {error}")
+        if verbose:
+            for registry_name, error in errors:
+                print(f"Traceback for registry '{registry_name}':")
+                traceback.print_exception(type(error), error, error.__traceback__)
+        else:
+            print("Run with --verbose (or LOG_LEVEL=DEBUG) to show full tracebacks.")
+
+
+def export_to_excel(models_data: Iterable[ModelRow], output_file: str) -> int:
     """
     Export models data to an Excel file with formatting.
     
     Args:
-        models_data: List of model dictionaries
+        models_data: Iterable of model rows, in HEADERS order
         output_file: Path to output Excel file
+        
+    Returns:
+        Number of models exported
     """
-    print(f"Exporting {len(models_data)} models to Excel...")
-    
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "AI Foundry Models"
-    
-    # Define headers
-    headers = ["Source", "Name", "Version", "Description", "Format", "Kind", "SKU", "Lifecycle Status", "Max Capacity", "Created Date", "Created By", "Last Modified Date", "Last Modified By"]
-    
-    # Style for headers
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF")
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    
-    # Write headers
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-    
-    # Write data
-    for row_num, model in enumerate(models_data, 2):
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = model.get(header, "N/A")
-            cell.alignment = Alignment(vertical="top", wrap_text=True)
-    
-    # Auto-adjust column widths
-    for col_num in range(1, len(headers) + 1):
-        column_letter = get_column_letter(col_num)
-        max_length = 0
-        for cell in ws[column_letter]:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except (TypeError, AttributeError):
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-    
-    # Freeze the header row
-    ws.freeze_panes = "A2"
-    
-    # Save the workbook
-    wb.save(output_file)
+    with print_lock:
+        print("Exporting models to Excel...")
+    
+    count = export_rows(models_data, HEADERS, output_file)
     print(f"Excel file saved to: {output_file}")
+    
+    return count
+
+
+def export_to_csv(models_data: Iterable[ModelRow], output_file: str) -> int:
+    """
+    Export models data to a CSV file.
+    
+    Args:
+        models_data: Iterable of model rows, in HEADERS order
+        output_file: Path to output CSV file
+        
+    Returns:
+        Number of models exported
+    """
+    with print_lock:
+        print("Exporting models to CSV...")
+    
+    count = 0
+    # A large buffer keeps the many small row writes from each hitting the disk
+    with open(output_file, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        for model in models_data:
+            writer.writerow(model)
+            count += 1
+    
+    print(f"CSV file saved to: {output_file}")
+    return count
+
+
+def export_to_parquet(models_data: Iterable[ModelRow], output_file: str) -> int:
+    """
+    Export models data to a Parquet file (requires pyarrow).
+    
+    All columns are written as strings, since fields such as Max Capacity mix
+    numbers with "N/A".
+    
+    Args:
+        models_data: Iterable of model rows, in HEADERS order
+        output_file: Path to output Parquet file
+        
+    Returns:
+        Number of models exported
+    """
+    import pyarrow
+    import pyarrow.parquet
+    
+    with print_lock:
+        print("Exporting models to Parquet...")
+    
+    columns = [[] for _ in HEADERS]
+    count = 0
+    for model in models_data:
+        for values, value in zip(columns, model):
+            values.append(str(value))
+        count += 1
+    
+    table = pyarrow.table(dict(zip(HEADERS, columns)))
+    pyarrow.parquet.write_table(table, output_file)
+    print(f"Parquet file saved to: {output_file}")
+    return count
+
+
+# Exporters by output format
+EXPORTERS = {
+    "xlsx": export_to_excel,
+    "csv": export_to_csv,
+    "parquet": export_to_parquet,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Export AI Foundry and Azure ML Registry models to Excel.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore cached model listings, fetch everything from Azure and refresh the cache")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Print full tracebacks for fetch errors (also enabled by LOG_LEVEL=DEBUG)")
+    parser.add_argument("--format", choices=sorted(EXPORTERS),
+                        help="Output format (default: taken from the --output extension, otherwise xlsx); "
+                             "csv and parquet skip the Excel styling and are faster for large exports")
+    parser.add_argument("--output", metavar="FILE",
+                        help="Output file (default: ai_foundry_models_YYYYMMDD_HHMMSS.<format>)")
+    args = parser.parse_args()
+    
+    if args.format is None:
+        extension = os.path.splitext(args.output)[1].lstrip(".").lower() if args.output else ""
+        if args.output and extension not in EXPORTERS:
+            parser.error(f"cannot infer the output format from '{args.output}'; use a .{', .'.join(sorted(EXPORTERS))} extension or pass --format")
+        args.format = extension or "xlsx"
+    
+    if args.format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        print("Error: Parquet output requires pyarrow. Install it with: pip install pyarrow")
+        sys.exit(1)
+    
+    return args
+
+
+def get_cache_ttl() -> int:
+    """
+    Determine the cache time-to-live from AZURE_ML_REGISTRY_CACHE_TTL.
+    
+    Returns:
+        Cache TTL in seconds (0 means caching is disabled)
+    """
+    ttl_str = os.getenv("AZURE_ML_REGISTRY_CACHE_TTL", str(DEFAULT_CACHE_TTL))
+    try:
+        return max(int(ttl_str), 0)
+    except ValueError:
+        print(f"Error: AZURE_ML_REGISTRY_CACHE_TTL must be an integer number of seconds, got '{ttl_str}'")
+        sys.exit(1)
 
 
 def main():
     """Main execution function."""
+    args = parse_args()
+    
     print("=" * 60)
     print("AI Foundry Models to Excel Exporter")
     print("=" * 60)
     print()
     
-    # Get management client and location
-    client, location = get_management_client()
+    # Get management client, subscription and location
+    client, subscription_id, location = get_management_client()
+    cache_ttl = get_cache_ttl()
+    verbose = args.verbose or os.getenv("LOG_LEVEL", "").upper() == "DEBUG"
     
     # Fetch models from AI Foundry catalog
-    models_data = fetch_models(client, location)
+    model_sources = [fetch_models(client, subscription_id, location, cache_ttl, refresh_cache=args.no_cache, verbose=verbose)]
     
     # Fetch models from Azure ML Registries
     load_dotenv()
@@ -257,26 +539,34 @@ def main():
     registry_names = [name.strip() for name in registry_names_str.split(",") if name.strip()]
     
     if registry_names:
-        print()
         print(f"Configured Azure ML Registries: {', '.join(registry_names)}")
-        credential = DefaultAzureCredential()
-        registry_models = fetch_registry_models(credential, registry_names)
-        models_data.extend(registry_models)
+        credential = get_credential()
+        # Authenticate once up front so the concurrent registry fetches reuse the token
+        try:
+            warm_up_credential(credential)
+        except Exception as e:
+            print(f"Error authenticating with Azure: {e}")
+            sys.exit(1)
+        model_sources.append(fetch_registry_models(credential, registry_names, cache_ttl, refresh_cache=args.no_cache, verbose=verbose))
+    print()
     
-    if not models_data:
-        print("No models found or error occurred.")
-        sys.exit(1)
+    # Generate output filename with timestamp unless one was given
+    output_file = args.output
+    if not output_file:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_file = f"ai_foundry_models_{timestamp}.{args.format}"
     
-    # Generate output filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = f"ai_foundry_models_{timestamp}.xlsx"
+    # Export in the requested format, streaming models from all sources
+    total_models = EXPORTERS[args.format](itertools.chain.from_iterable(model_sources), output_file)
     
-    # Export to Excel
-    export_to_excel(models_data, output_file)
+    if not total_models:
+        os.remove(output_file)
+        print("No models found or error occurred.")
+        sys.exit(1)
     
     print()
     print("=" * 60)
-    print(f"Total models exported: {len(models_data)}")
+    print(f"Total models exported: {total_models}")
     print("Export completed successfully!")
     print("=" * 60)
 